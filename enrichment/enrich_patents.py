@@ -11,6 +11,7 @@ Usage:
 """
 
 import argparse
+import asyncio
 import json
 import os
 import sys
@@ -23,10 +24,28 @@ from enrichment import uspto_download
 from enrichment import xml_parser
 from enrichment import google_patents
 
+# orjson is much faster for large portfolios but optional; both paths emit
+# the same UTF-8 bytes (2-space indent, non-ASCII unescaped)
+try:
+    import orjson
+    
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    
+    def _loads(data):
+        return orjson.loads(data)
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    
+    def _loads(data):
+        return json.loads(data)
+
 # Configuration
 DEFAULT_TEMPLATE = "examples/IPTLpatents-template.json"
 DEFAULT_OUTPUT = "examples/IPTLpatents-enriched.json"
 DOWNLOADS_DIR = "downloads"
+GOOGLE_HTML_CACHE_SUBDIR = "google_html"
 USPTO_API_KEY_ENV = "USPTO_API_KEY"
 
 
@@ -86,6 +105,21 @@ Examples:
         help="Skip Google Patents scraping"
     )
     
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always fetch Google Patents pages, ignoring the on-disk HTML cache"
+    )
+    
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=google_patents.DEFAULT_CACHE_TTL_DAYS,
+        metavar="DAYS",
+        help=f"Refetch cached Google Patents pages older than DAYS "
+             f"(default: {google_patents.DEFAULT_CACHE_TTL_DAYS})"
+    )
+    
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -97,8 +131,8 @@ Examples:
 
 def load_template(template_path):
     """Load the patent template JSON file."""
-    with open(template_path, 'r') as f:
-        return json.load(f)
+    with open(template_path, 'rb') as f:
+        return _loads(f.read())
 
 
 def get_patent_numbers(template_data):
@@ -110,9 +144,8 @@ def build_patent_to_file_mapping(patent_numbers, downloads_dir):
     """Build mapping of patent numbers to their ZIP file paths."""
     patent_to_file = {}
     for patent_num in patent_numbers:
-        if patent_num in uspto_download.PATENT_GRANT_DATES:
-            grant_date = uspto_download.PATENT_GRANT_DATES[patent_num]
-            filename = uspto_download.grant_date_to_weekly_filename(grant_date)
+        filename = uspto_download.PATENT_TO_FILENAME.get(patent_num)
+        if filename is not None:
             patent_to_file[patent_num] = os.path.join(downloads_dir, filename)
     return patent_to_file
 
@@ -121,6 +154,9 @@ def merge_patent_data(uspto_data, google_data, patent_number):
     """
     Merge USPTO and Google Patents data for a single patent.
     
+    uspto_data is an xml_parser.PatentData record, or None if the patent
+    couldn't be extracted.
+    
     Returns a dict matching the target JSON schema.
     """
     result = {
@@ -141,15 +177,15 @@ def merge_patent_data(uspto_data, google_data, patent_number):
     }
     
     # From USPTO XML
-    if uspto_data:
-        result["title"] = uspto_data.get("title")
-        result["grant_date"] = uspto_data.get("grant_date")
-        result["priority_date"] = uspto_data.get("priority_date")
-        result["application_number"] = uspto_data.get("application_number")
-        result["assignee_original"] = uspto_data.get("assignee_original")
-        result["abstract"] = uspto_data.get("abstract")
-        result["independent_claims"] = uspto_data.get("independent_claims", [])
-        result["application_family_members"] = uspto_data.get("application_family_members", [])
+    if uspto_data is not None:
+        result["title"] = uspto_data.title
+        result["grant_date"] = uspto_data.grant_date
+        result["priority_date"] = uspto_data.priority_date
+        result["application_number"] = uspto_data.application_number
+        result["assignee_original"] = uspto_data.assignee_original
+        result["abstract"] = uspto_data.abstract
+        result["independent_claims"] = [claim.to_dict() for claim in uspto_data.independent_claims]
+        result["application_family_members"] = uspto_data.application_family_members
     
     # From Google Patents (enrichment)
     if google_data:
@@ -166,65 +202,83 @@ def merge_patent_data(uspto_data, google_data, patent_number):
     return result
 
 
-def generate_output(template_data, uspto_results, google_results):
+def iter_merged_patents(template_data, uspto_results, google_results):
     """
-    Generate the final enriched JSON structure.
+    Yield the merged record for each template patent, in template order.
     """
-    output = {
-        "portfolio": {
-            "assignee": None,
-            "patent_count": 0,
-            "generated": date.today().isoformat()
-        },
-        "patents": []
-    }
-    
-    # Process each patent from template
     for template_patent in template_data.get("patents", []):
         patent_num = template_patent["number"]
         
-        uspto_data = uspto_results.get(patent_num, {})
+        uspto_data = uspto_results.get(patent_num)
         google_data = google_results.get(patent_num, {})
         
-        merged = merge_patent_data(uspto_data, google_data, patent_num)
-        output["patents"].append(merged)
-    
-    # Set portfolio metadata
-    output["portfolio"]["patent_count"] = len(output["patents"])
-    
-    # Get assignee from first patent with one
-    for patent in output["patents"]:
-        if patent.get("assignee_original"):
-            output["portfolio"]["assignee"] = patent["assignee_original"]
-            break
-    
-    return output
+        yield merge_patent_data(uspto_data, google_data, patent_num)
 
 
-def main():
-    """Main entry point."""
-    args = parse_args()
+def portfolio_assignee(template_data, uspto_results):
+    """
+    Portfolio assignee: the original assignee of the first template patent that has one.
+    """
+    for template_patent in template_data.get("patents", []):
+        uspto_data = uspto_results.get(template_patent["number"])
+        if uspto_data is not None and uspto_data.assignee_original:
+            return uspto_data.assignee_original
+    return None
+
+
+def write_output(f, template_data, uspto_results, google_results):
+    """
+    Stream the enriched JSON to a binary file, one patent at a time.
     
-    print(f"USPTO Patent Data Enrichment Tool")
-    print(f"==================================")
-    print(f"Template: {args.template}")
-    print(f"Output:   {args.output}")
-    print(f"Downloads: {args.downloads_dir}")
-    print()
+    The document is {"portfolio": {...}, "patents": [...]} with a 2-space
+    indent, written without holding the merged patent list in memory.
     
-    # Load template
-    if not os.path.exists(args.template):
-        print(f"Error: Template file not found: {args.template}")
-        return 1
+    Returns (portfolio, summary): the portfolio metadata written to the
+    header, and a (number, title, claim count, forward cites, expiration)
+    tuple per patent for the console summary.
+    """
+    # The header comes first in the document, so the assignee is looked up
+    # before streaming; this stops at the first patent that has one and
+    # merges nothing
+    portfolio = {
+        "assignee": portfolio_assignee(template_data, uspto_results),
+        "patent_count": len(template_data.get("patents", [])),
+        "generated": date.today().isoformat()
+    }
     
-    template_data = load_template(args.template)
-    patent_numbers = get_patent_numbers(template_data)
+    # Indent each nested document to its depth in the top-level object;
+    # JSON strings escape newlines, so every literal newline is structural
+    f.write(b'{\n  "portfolio": ')
+    f.write(_dumps(portfolio).replace(b'\n', b'\n  '))
+    f.write(b',\n  "patents": [')
     
-    print(f"Found {len(patent_numbers)} patents in template:")
-    for num in patent_numbers:
-        print(f"  - {num}")
-    print()
+    summary = []
+    first = True
+    for merged in iter_merged_patents(template_data, uspto_results, google_results):
+        f.write(b'\n    ' if first else b',\n    ')
+        f.write(_dumps(merged).replace(b'\n', b'\n    '))
+        first = False
+        summary.append((
+            merged["number"],
+            merged["title"],
+            len(merged["independent_claims"]),
+            merged["forward_cites"],
+            merged["expiration"],
+        ))
+    
+    f.write(b']' if first else b'\n  ]')
+    f.write(b'\n}')
+    
+    return portfolio, summary
+
+
+def run_uspto_phase(args, patent_numbers):
+    """
+    Download (unless --scrape-only) and parse the USPTO XML for all patents.
     
+    Returns (exit_code, uspto_results); exit_code is None when the pipeline
+    should continue to output generation.
+    """
     # Phase 2: Download USPTO files (if needed)
     if not args.scrape_only:
         if not args.api_key:
@@ -243,11 +297,11 @@ def main():
         if missing:
             print(f"Missing patents: {missing}")
             if not args.download_only:
-                return 1
+                return 1, {}
         
         if args.download_only:
             print("\n--download-only specified, stopping here.")
-            return 0
+            return 0, {}
     
     # Phase 3-4: Parse USPTO XML
     print("\nPhase 3-4: Parsing USPTO XML files...")
@@ -256,26 +310,73 @@ def main():
     uspto_results = xml_parser.extract_all_patents(patent_to_file, verbose=args.verbose)
     print(f"  Extracted {len(uspto_results)}/{len(patent_numbers)} patents from USPTO XML")
     
-    # Phase 5-6: Scrape Google Patents (if not skipped)
-    google_results = {}
-    if not args.skip_google:
-        print("\nPhase 5-6: Scraping Google Patents for enrichment data...")
-        google_results = google_patents.scrape_all_patents(
+    return None, uspto_results
+
+
+async def main_async(args):
+    """
+    Run the enrichment pipeline.
+    
+    Google Patents scraping does not depend on USPTO data, so it runs
+    concurrently with the USPTO download and parse phases.
+    """
+    print(f"USPTO Patent Data Enrichment Tool")
+    print(f"==================================")
+    print(f"Template: {args.template}")
+    print(f"Output:   {args.output}")
+    print(f"Downloads: {args.downloads_dir}")
+    print()
+    
+    # Load template
+    if not os.path.exists(args.template):
+        print(f"Error: Template file not found: {args.template}")
+        return 1
+    
+    template_data = load_template(args.template)
+    patent_numbers = get_patent_numbers(template_data)
+    
+    print(f"Found {len(patent_numbers)} patents in template:")
+    for num in patent_numbers:
+        print(f"  - {num}")
+    print()
+    
+    # Phase 5-6: Scrape Google Patents (if not skipped) in the background
+    google_task = None
+    if args.skip_google:
+        print("Skipping Google Patents scraping (--skip-google)\n")
+    elif not args.download_only:
+        print("Phase 5-6: Scraping Google Patents for enrichment data (in background)...\n")
+        cache_dir = None
+        if not args.no_cache:
+            cache_dir = os.path.join(args.downloads_dir, GOOGLE_HTML_CACHE_SUBDIR)
+        google_task = asyncio.ensure_future(google_patents.scrape_all_patents_async(
             patent_numbers, 
             delay=1.0, 
-            verbose=args.verbose
-        )
+            verbose=args.verbose,
+            cache_dir=cache_dir,
+            ttl_days=args.cache_ttl
+        ))
+    
+    # Phase 2-4: USPTO download and parse are blocking, so run them in a thread
+    loop = asyncio.get_running_loop()
+    uspto_task = loop.run_in_executor(None, run_uspto_phase, args, patent_numbers)
+    
+    exit_code, uspto_results = await uspto_task
+    if exit_code is not None:
+        # asyncio.run() cancels the still-pending scrape on return
+        return exit_code
+    
+    google_results = {}
+    if google_task is not None:
+        google_results = await google_task
         print(f"  Scraped {len(google_results)}/{len(patent_numbers)} patents from Google Patents")
-    else:
-        print("\nSkipping Google Patents scraping (--skip-google)")
     
     # Phase 7: Generate output JSON
     print("\nPhase 7: Generating enriched JSON output...")
-    output_data = generate_output(template_data, uspto_results, google_results)
     
     # Write output file
-    with open(args.output, 'w') as f:
-        json.dump(output_data, f, indent=2)
+    with open(args.output, 'wb') as f:
+        portfolio, summary = write_output(f, template_data, uspto_results, google_results)
     
     print(f"  Wrote enriched data to: {args.output}")
     
@@ -283,21 +384,23 @@ def main():
     print("\n" + "=" * 60)
     print("ENRICHMENT COMPLETE")
     print("=" * 60)
-    print(f"Portfolio: {output_data['portfolio']['assignee']}")
-    print(f"Patents:   {output_data['portfolio']['patent_count']}")
-    print(f"Generated: {output_data['portfolio']['generated']}")
+    print(f"Portfolio: {portfolio['assignee']}")
+    print(f"Patents:   {portfolio['patent_count']}")
+    print(f"Generated: {portfolio['generated']}")
     print()
     
-    for patent in output_data['patents']:
-        title = (patent.get('title') or 'NO TITLE')[:50]
-        claims = len(patent.get('independent_claims', []))
-        cites = patent.get('forward_cites', 0)
-        exp = patent.get('expiration', 'N/A')
-        print(f"  {patent['number']}: {title}...")
+    for number, title, claims, cites, exp in summary:
+        print(f"  {number}: {(title or 'NO TITLE')[:50]}...")
         print(f"      claims: {claims}, cites: {cites}, exp: {exp}")
     
     return 0
 
 
+def main():
+    """Main entry point."""
+    args = parse_args()
+    return asyncio.run(main_async(args))
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -10,212 +10,516 @@ Scrapes enrichment data from Google Patents:
 - assignee_current
 """
 
+import asyncio
+import base64
+import gzip
+import heapq
+import http.client
+import os
 import re
+import tempfile
+import threading
 import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 import urllib.request
-import urllib.error
-from typing import Dict, List, Optional
+from urllib.parse import unquote, urlparse
 
+GOOGLE_PATENTS_HOST = "patents.google.com"
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+    'Accept': 'text/html,application/xhtml+xml',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+MAX_REDIRECTS = 3
 
-def fetch_google_patents_page(patent_number: str) -> Optional[str]:
+# Number of pages fetched at once; kept small to stay polite to Google
+DEFAULT_CONCURRENCY = 6
+
+# Cached pages older than this are fetched again (citations change over time)
+DEFAULT_CACHE_TTL_DAYS = 7
+
+# Keep-alive HTTPS connection per worker thread (http.client is not thread-safe)
+_thread_local = threading.local()
+
+# Patterns used by parse_google_patents_html, compiled once at import
+H2_RE = re.compile(r'<h2>(.*?)</h2>')
+CITED_BY_HEADING_RE = re.compile(r'Cited By \((\d+)\)')
+FAMILIES_CITING_HEADING_RE = re.compile(r'Families Citing this family(?: \((\d+)\))?')
+FAMILY_APPS_HEADING_RE = re.compile(r'Family Applications \(\d+\)')
+ALSO_PUBLISHED_HEADING_RE = re.compile(r'Also Published As')
+PRIORITY_APPS_HEADING_RE = re.compile(r'Priority Applications \(\d+\)')
+EXP_ITEMPROP_RE = re.compile(r'itemprop="expiration"[^>]*datetime="(\d{4}-\d{2}-\d{2})"')
+EXP_IFI_RE = re.compile(r'itemprop="ifiExpiration">(\d{4}-\d{2}-\d{2})<')
+EXP_LEGAL_EVENT_RE = re.compile(
+    r'<time[^>]*datetime="(\d{4}-\d{2}-\d{2})"[^>]*>[^<]*</time>\s*\n?\s*<span[^>]*>(?:Anticipated|Adjusted) expiration'
+)
+ASSIGNEE_RE = re.compile(r'Current Assignee.*?<dd[^>]*>(.*?)</dd>', re.DOTALL | re.IGNORECASE)
+TAG_RE = re.compile(r'<[^>]+>')
+LISTED_ASSIGNEES_RE = re.compile(r'The listed assignees.*', re.IGNORECASE)
+GOOGLE_DISCLAIMER_RE = re.compile(r'Google has not.*', re.IGNORECASE)
+ASSIGNEE_ORIGINAL_SPAN_RE = re.compile(r'<span[^>]*itemprop="assigneeOriginal"[^>]*>([^<]+)</span>')
+US_PUB_RE = re.compile(r'>(US\d{7,}[AB]\d?)<')
+ASSIGNEE_ORIGINAL_RE = re.compile(r'itemprop="assigneeOriginal"[^>]*>([^<]+)<')
+
+
+def empty_enrichment() -> Dict:
     """
-    Fetch the Google Patents page for a patent.
+    Placeholder enrichment used when a patent could not be scraped.
     """
-    url = f"https://patents.google.com/patent/{patent_number}/en"
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
-        'Accept': 'text/html,application/xhtml+xml',
-        'Accept-Language': 'en-US,en;q=0.9',
+    return {
+        'forward_cites': 0,
+        'top_citing_assignees': None,
+        'simple_family_members': [],
+        'expiration': None,
+        'assignee_current': None
     }
+
+
+def open_connection(scheme: str, netloc: str, timeout: float) -> http.client.HTTPConnection:
+    """
+    Open an HTTP(S) connection to netloc, through the configured proxy if any.
+    
+    http.client ignores http_proxy/https_proxy/no_proxy, which urllib
+    honours; this applies the same settings and tunnels through the proxy
+    with CONNECT, so callers send the same request paths either way.
+    """
+    conn_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+    proxy = urllib.request.getproxies().get(scheme)
+    if not proxy or urllib.request.proxy_bypass(urlparse(f"//{netloc}").hostname):
+        return conn_class(netloc, timeout=timeout)
+    
+    proxy_url = urlparse(proxy if '://' in proxy else f"http://{proxy}")
+    headers = {}
+    if proxy_url.username:
+        credentials = f"{unquote(proxy_url.username)}:{unquote(proxy_url.password or '')}"
+        headers['Proxy-Authorization'] = 'Basic ' + base64.b64encode(credentials.encode()).decode('ascii')
+    conn = conn_class(proxy_url.hostname, proxy_url.port or 80, timeout=timeout)
+    conn.set_tunnel(netloc, headers=headers)
+    return conn
+
+
+def get_connection() -> http.client.HTTPSConnection:
+    """
+    Return this thread's persistent connection to Google Patents.
+    
+    Reusing the connection means the TCP+TLS handshake is paid once per
+    worker thread rather than once per patent.
+    """
+    conn = getattr(_thread_local, 'connection', None)
+    if conn is None:
+        conn = open_connection('https', GOOGLE_PATENTS_HOST, timeout=30)
+        _thread_local.connection = conn
+    return conn
+
+
+def reset_connection() -> None:
+    """
+    Close and forget this thread's connection so the next request reconnects.
+    """
+    conn = getattr(_thread_local, 'connection', None)
+    if conn is not None:
+        conn.close()
+        _thread_local.connection = None
+
+
+def cache_path_for(cache_dir: str, patent_number: str) -> str:
+    """
+    Path of the gzipped HTML cache entry for a patent.
+    """
+    return os.path.join(cache_dir, f"{patent_number}.html.gz")
+
+
+def read_cached_page(cache_dir: str, patent_number: str,
+                     ttl_days: Optional[float] = None) -> Optional[str]:
+    """
+    Return the cached page for a patent, or None if missing or stale.
     
+    A ttl_days of None means cache entries never expire.
+    """
+    cache_path = cache_path_for(cache_dir, patent_number)
     try:
-        req = urllib.request.Request(url, headers=headers)
-        with urllib.request.urlopen(req, timeout=30) as response:
-            return response.read().decode('utf-8', errors='replace')
-    except urllib.error.HTTPError as e:
-        print(f"  HTTP Error {e.code} for {patent_number}")
-        return None
-    except urllib.error.URLError as e:
-        print(f"  URL Error for {patent_number}: {e.reason}")
-        return None
-    except Exception as e:
-        print(f"  Error fetching {patent_number}: {e}")
+        if ttl_days is not None:
+            age = time.time() - os.path.getmtime(cache_path)
+            if age > ttl_days * 86400:
+                return None
+        with open(cache_path, 'rb') as f:
+            return gzip.decompress(f.read()).decode('utf-8')
+    except (OSError, EOFError, UnicodeDecodeError):
         return None
 
 
+def write_cached_page(cache_dir: str, patent_number: str, html: str) -> None:
+    """
+    Store a page in the cache, atomically so readers never see a partial file.
+    """
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(gzip.compress(html.encode('utf-8')))
+            os.replace(tmp_path, cache_path_for(cache_dir, patent_number))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        print(f"  Warning: could not cache {patent_number}: {e}")
+
+
+def fetch_google_patents_page(patent_number: str, cache_dir: Optional[str] = None,
+                              ttl_days: Optional[float] = DEFAULT_CACHE_TTL_DAYS) -> Optional[str]:
+    """
+    Fetch the Google Patents page for a patent.
+    
+    If cache_dir is given, a fresh cached copy is returned without touching
+    the network, and newly fetched pages are added to the cache.
+    """
+    if cache_dir:
+        html = read_cached_page(cache_dir, patent_number, ttl_days)
+        if html is not None:
+            return html
+    
+    html = download_google_patents_page(patent_number)
+    if html is not None and cache_dir:
+        write_cached_page(cache_dir, patent_number, html)
+    return html
+
+
+def download_google_patents_page(patent_number: str) -> Optional[str]:
+    """
+    Download the Google Patents page for a patent over the keep-alive connection.
+    """
+    path = f"/patent/{patent_number}/en"
+    retried = False
+    redirects = 0
+    
+    while True:
+        try:
+            conn = get_connection()
+            conn.request('GET', path, headers=REQUEST_HEADERS)
+            response = conn.getresponse()
+            body = response.read()
+        except (http.client.HTTPException, OSError) as e:
+            reset_connection()
+            # The server may have dropped an idle keep-alive connection; retry once
+            if not retried:
+                retried = True
+                continue
+            print(f"  URL Error for {patent_number}: {e}")
+            return None
+        except Exception as e:
+            reset_connection()
+            print(f"  Error fetching {patent_number}: {e}")
+            return None
+        
+        if response.status in (301, 302, 303, 307, 308) and redirects < MAX_REDIRECTS:
+            location = urlparse(response.getheader('Location', ''))
+            if location.netloc in ('', GOOGLE_PATENTS_HOST) and location.path:
+                path = location.path + (f"?{location.query}" if location.query else '')
+                redirects += 1
+                continue
+        
+        if response.status != 200:
+            print(f"  HTTP Error {response.status} for {patent_number}")
+            return None
+        
+        return body.decode('utf-8', errors='replace')
+
+
+def index_sections(html: str) -> List[Tuple[str, int, int]]:
+    """
+    Split a Google Patents page at its <h2> headings in a single pass.
+    
+    Returns (heading, start, end) tuples where html[start:end] is the
+    section body up to the next heading. Bodies are kept as offsets so the
+    section patterns can scan them in place without copying the page.
+    """
+    headings = list(H2_RE.finditer(html))
+    sections = []
+    for i, match in enumerate(headings):
+        end = headings[i + 1].start() if i + 1 < len(headings) else len(html)
+        sections.append((match.group(1), match.end(), end))
+    return sections
+
+
+def clip_section(html: str, start: int, end: int, stop: str) -> Tuple[int, int]:
+    """
+    Trim a section body at the first `stop` tag inside it, if any.
+    """
+    stop_pos = html.find(stop, start, end)
+    return start, (stop_pos if stop_pos != -1 else end)
+
+
+def find_section(html: str, sections: List[Tuple[str, int, int]], heading_re,
+                 stop: str) -> Optional[Tuple[int, int]]:
+    """
+    Locate the body of the first section whose heading matches `heading_re`.
+    
+    The body ends at the next heading or at the first `stop` tag inside it.
+    """
+    for heading, start, end in sections:
+        if heading_re.match(heading):
+            return clip_section(html, start, end, stop)
+    return None
+
+
 def parse_google_patents_html(html: str, patent_number: str) -> Dict:
     """
     Parse Google Patents HTML to extract enrichment data.
     """
-    result = {
-        'forward_cites': 0,
-        'top_citing_assignees': None,
-        'simple_family_members': [],
-        'expiration': None,
-        'assignee_current': None
-    }
+    result = empty_enrichment()
+    
+    # Index the <h2> sections once; the section-scoped lookups below only
+    # scan their own slice of the page
+    sections = index_sections(html)
     
     # 1. Extract forward citations 
     # Sum "Cited By (N)" sections + "Families Citing this family (N)"
-    cited_by_counts = re.findall(r'<h2>Cited By \((\d+)\)</h2>', html)
-    families_citing = re.search(r'Families Citing this family \((\d+)\)', html)
+    cited_by_counts = []
+    families_citing = None
+    for heading, _, _ in sections:
+        cited_by = CITED_BY_HEADING_RE.fullmatch(heading)
+        if cited_by:
+            cited_by_counts.append(cited_by.group(1))
+        elif families_citing is None:
+            families_citing = FAMILIES_CITING_HEADING_RE.match(heading)
     
     total_cites = sum(int(c) for c in cited_by_counts)
-    if families_citing:
+    if families_citing and families_citing.group(1):
         total_cites += int(families_citing.group(1))
     result['forward_cites'] = total_cites
     
     # 2. Extract expiration date (handles both Adjusted and Anticipated)
-    exp_match = re.search(r'itemprop="expiration"[^>]*datetime="(\d{4}-\d{2}-\d{2})"', html)
+    exp_match = EXP_ITEMPROP_RE.search(html)
     if not exp_match:
-        exp_match = re.search(r'itemprop="ifiExpiration">(\d{4}-\d{2}-\d{2})<', html)
+        exp_match = EXP_IFI_RE.search(html)
     if not exp_match:
         # Look for date in legal events before "Anticipated expiration" or "Adjusted expiration"
         # Pattern: <time itemprop="date" datetime="YYYY-MM-DD">...</time>\n...<span>Anticipated expiration
-        exp_match = re.search(
-            r'<time[^>]*datetime="(\d{4}-\d{2}-\d{2})"[^>]*>[^<]*</time>\s*\n?\s*<span[^>]*>(?:Anticipated|Adjusted) expiration',
-            html
-        )
+        exp_match = EXP_LEGAL_EVENT_RE.search(html)
     if exp_match:
         result['expiration'] = exp_match.group(1)
     
     # 3. Extract current assignee
-    assignee_match = re.search(
-        r'Current Assignee.*?<dd[^>]*>(.*?)</dd>',
-        html, re.DOTALL | re.IGNORECASE
-    )
+    assignee_match = ASSIGNEE_RE.search(html)
     if assignee_match:
         assignee_html = assignee_match.group(1)
-        assignee_clean = re.sub(r'<[^>]+>', ' ', assignee_html)
-        assignee_clean = re.sub(r'The listed assignees.*', '', assignee_clean, flags=re.I)
-        assignee_clean = re.sub(r'Google has not.*', '', assignee_clean, flags=re.I)
+        assignee_clean = TAG_RE.sub(' ', assignee_html)
+        assignee_clean = LISTED_ASSIGNEES_RE.sub('', assignee_clean)
+        assignee_clean = GOOGLE_DISCLAIMER_RE.sub('', assignee_clean)
         assignee_clean = ' '.join(assignee_clean.split()).strip()
         if assignee_clean and len(assignee_clean) > 2:
             result['assignee_current'] = assignee_clean
     
     if not result['assignee_current']:
-        alt_match = re.search(
-            r'<span[^>]*itemprop="assigneeOriginal"[^>]*>([^<]+)</span>',
-            html
-        )
+        alt_match = ASSIGNEE_ORIGINAL_SPAN_RE.search(html)
         if alt_match:
             result['assignee_current'] = alt_match.group(1).strip()
     
     # 4. Extract simple family members from multiple sections
     family_pubs = set()
     
-    # Family Applications section
-    family_match = re.search(
-        r'<h2>Family Applications \(\d+\)</h2>(.*?)(?=<h2>|</section>)', 
-        html, re.DOTALL
-    )
-    if family_match:
-        pubs = re.findall(r'>(US\d{7,}[AB]\d?)<', family_match.group(1))
-        family_pubs.update(pubs)
-    
-    # Also Published As section  
-    also_match = re.search(
-        r'<h2>Also Published As</h2>(.*?)(?=<h2>|</section>)', 
-        html, re.DOTALL
-    )
-    if also_match:
-        pubs = re.findall(r'>(US\d{7,}[AB]\d?)<', also_match.group(1))
-        family_pubs.update(pubs)
-    
-    # Priority Applications section
-    priority_match = re.search(
-        r'<h2>Priority Applications \(\d+\)</h2>(.*?)(?=<h2>|</section>)', 
-        html, re.DOTALL
-    )
-    if priority_match:
-        pubs = re.findall(r'>(US\d{7,}[AB]\d?)<', priority_match.group(1))
-        family_pubs.update(pubs)
+    for heading_re in (FAMILY_APPS_HEADING_RE,      # Family Applications section
+                       ALSO_PUBLISHED_HEADING_RE,   # Also Published As section
+                       PRIORITY_APPS_HEADING_RE):   # Priority Applications section
+        span = find_section(html, sections, heading_re, '</section>')
+        if span:
+            family_pubs.update(US_PUB_RE.findall(html, *span))
     
     # Remove self from family
     family_pubs.discard(patent_number)
     result['simple_family_members'] = sorted(list(family_pubs))
     
     # 5. Extract top citing assignees from Cited By and Families Citing tables
-    assignee_counts = {}
+    # Only those sections are scanned, so each citing entry is counted once
+    # and the rest of the page is never searched
+    assignee_counts = Counter()
     
-    # Get assignees from forwardReferences entries
-    citing_entries = re.findall(
-        r'itemprop="forward[Rr]eferences[^"]*".*?itemprop="assigneeOriginal"[^>]*>([^<]+)<',
-        html, re.DOTALL
-    )
-    for assignee in citing_entries:
-        assignee_clean = assignee.strip().upper()
-        if assignee_clean and len(assignee_clean) > 3:
-            assignee_counts[assignee_clean] = assignee_counts.get(assignee_clean, 0) + 1
-    
-    # Also get from Families Citing section
-    families_citing_section = re.search(
-        r'<h2>Families Citing this family.*?</h2>(.*?)(?=<h2>|</article>)',
-        html, re.DOTALL
-    )
-    if families_citing_section:
-        family_assignees = re.findall(
-            r'itemprop="assigneeOriginal"[^>]*>([^<]+)<',
-            families_citing_section.group(1)
-        )
-        for assignee in family_assignees:
+    for heading, start, end in sections:
+        if not (CITED_BY_HEADING_RE.fullmatch(heading) or FAMILIES_CITING_HEADING_RE.match(heading)):
+            continue
+        for assignee in ASSIGNEE_ORIGINAL_RE.findall(html, *clip_section(html, start, end, '</article>')):
             assignee_clean = assignee.strip().upper()
             if assignee_clean and len(assignee_clean) > 3:
-                assignee_counts[assignee_clean] = assignee_counts.get(assignee_clean, 0) + 1
+                assignee_counts[assignee_clean] += 1
     
     if assignee_counts:
-        sorted_assignees = sorted(assignee_counts.items(), key=lambda x: (-x[1], x[0]))
+        # Top 7 by count, ties broken alphabetically; a bounded heap avoids
+        # sorting every assignee (Counter.most_common would order ties by
+        # first appearance instead)
+        top_assignees = heapq.nsmallest(7, assignee_counts.items(), key=lambda x: (-x[1], x[0]))
         result['top_citing_assignees'] = [
-            f"{name} ({count})" for name, count in sorted_assignees[:7]
+            f"{name} ({count})" for name, count in top_assignees
         ]
     
     return result
 
 
-def scrape_patent_enrichment(patent_number: str) -> Optional[Dict]:
+def scrape_patent_enrichment(patent_number: str, cache_dir: Optional[str] = None,
+                             ttl_days: Optional[float] = DEFAULT_CACHE_TTL_DAYS) -> Optional[Dict]:
     """
     Scrape enrichment data for a single patent from Google Patents.
     """
-    html = fetch_google_patents_page(patent_number)
+    html = fetch_google_patents_page(patent_number, cache_dir, ttl_days)
     if html is None:
         return None
     
     return parse_google_patents_html(html, patent_number)
 
 
-def scrape_all_patents(patent_numbers: List[str], delay: float = 1.0, 
-                       verbose: bool = False) -> Dict[str, Dict]:
+def parse_cached_page(patent_number: str, cache_dir: str,
+                      ttl_days: Optional[float] = DEFAULT_CACHE_TTL_DAYS) -> Optional[Dict]:
     """
-    Scrape enrichment data for all patents with rate limiting.
+    Parse enrichment data from a patent's cached page, or None on a cache miss.
     """
-    results = {}
+    html = read_cached_page(cache_dir, patent_number, ttl_days)
+    if html is None:
+        return None
+    
+    return parse_google_patents_html(html, patent_number)
+
+
+def download_and_parse(patent_number: str, cache_dir: Optional[str] = None) -> Optional[Dict]:
+    """
+    Download and parse a patent's page without consulting the cache first.
+    
+    The page is still added to cache_dir, if given.
+    """
+    html = download_google_patents_page(patent_number)
+    if html is None:
+        return None
+    
+    if cache_dir:
+        write_cached_page(cache_dir, patent_number, html)
+    return parse_google_patents_html(html, patent_number)
+
+
+class RateLimiter:
+    """
+    Allow at most `max_calls` requests in any `period`-second window.
     
-    for i, patent_num in enumerate(patent_numbers):
-        if verbose:
-            print(f"  [{i+1}/{len(patent_numbers)}] Scraping {patent_num}...")
+    Unlike a fixed sleep after each request, time spent waiting on a slow
+    response counts toward the window, so callers are only held back when
+    requests are actually being issued too quickly.
+    """
+    
+    def __init__(self, max_calls: int, period: float):
+        self.max_calls = max_calls
+        self.period = period
+        self.last_times = deque()
+        self.lock = None
+    
+    async def wait(self) -> None:
+        """
+        Block until another request may start, then record it.
+        """
+        if self.lock is None:
+            # Created lazily so it belongs to the running event loop
+            self.lock = asyncio.Lock()
         
-        data = scrape_patent_enrichment(patent_num)
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                while self.last_times and now - self.last_times[0] >= self.period:
+                    self.last_times.popleft()
+                if len(self.last_times) < self.max_calls:
+                    self.last_times.append(now)
+                    return
+                await asyncio.sleep(self.period - (now - self.last_times[0]))
+
+
+async def fetch_cached(executor: ThreadPoolExecutor, patent_number: str, cache_dir: str,
+                       ttl_days: Optional[float] = DEFAULT_CACHE_TTL_DAYS) -> Optional[Dict]:
+    """
+    Read and parse a cached page in a worker thread; None on a cache miss.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, parse_cached_page, patent_number, cache_dir, ttl_days
+    )
+
+
+async def fetch_and_parse(executor: ThreadPoolExecutor, patent_number: str,
+                          cache_dir: Optional[str] = None) -> Optional[Dict]:
+    """
+    Download and parse enrichment data for a single patent in a worker thread.
+    
+    Both the request and the regex parsing happen off the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, download_and_parse, patent_number, cache_dir
+    )
+
+
+async def scrape_all_patents_async(patent_numbers: List[str], delay: float = 1.0,
+                                   verbose: bool = False,
+                                   concurrency: int = DEFAULT_CONCURRENCY,
+                                   cache_dir: Optional[str] = None,
+                                   ttl_days: Optional[float] = DEFAULT_CACHE_TTL_DAYS) -> Dict[str, Dict]:
+    """
+    Scrape enrichment data for all patents concurrently with rate limiting.
+    
+    Up to `concurrency` pages are in flight at once, and at most
+    `concurrency` requests start in any `delay`-second window. Pages found
+    in cache_dir (if given) skip the network and the rate limit entirely.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(concurrency, delay)
+    
+    async def scrape_one(i: int, patent_num: str) -> Optional[Dict]:
+        data = await fetch_cached(executor, patent_num, cache_dir, ttl_days) if cache_dir else None
+        if data is not None:
+            if verbose:
+                print(f"  [{i+1}/{len(patent_numbers)}] Cached {patent_num}")
+        else:
+            async with semaphore:
+                await limiter.wait()
+                if verbose:
+                    print(f"  [{i+1}/{len(patent_numbers)}] Scraping {patent_num}...")
+                data = await fetch_and_parse(executor, patent_num, cache_dir)
+        if data and verbose:
+            print(f"      {patent_num} forward_cites: {data['forward_cites']}, expiration: {data['expiration']}")
+        return data
+    
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        scraped = await asyncio.gather(
+            *[scrape_one(i, p) for i, p in enumerate(patent_numbers)],
+            return_exceptions=True
+        )
+    
+    results = {}
+    for patent_num, data in zip(patent_numbers, scraped):
+        if isinstance(data, Exception):
+            print(f"  Error scraping {patent_num}: {data}")
+            data = None
         if data:
             results[patent_num] = data
-            if verbose:
-                print(f"      forward_cites: {data['forward_cites']}, expiration: {data['expiration']}")
         else:
             print(f"  WARNING: Failed to scrape {patent_num}")
-            results[patent_num] = {
-                'forward_cites': 0,
-                'top_citing_assignees': None,
-                'simple_family_members': [],
-                'expiration': None,
-                'assignee_current': None
-            }
-        
-        if i < len(patent_numbers) - 1:
-            time.sleep(delay)
+            results[patent_num] = empty_enrichment()
     
     return results
 
 
+def scrape_all_patents(patent_numbers: List[str], delay: float = 1.0, 
+                       verbose: bool = False,
+                       concurrency: int = DEFAULT_CONCURRENCY,
+                       cache_dir: Optional[str] = None,
+                       ttl_days: Optional[float] = DEFAULT_CACHE_TTL_DAYS) -> Dict[str, Dict]:
+    """
+    Scrape enrichment data for all patents with rate limiting.
+    
+    Synchronous wrapper around scrape_all_patents_async().
+    """
+    return asyncio.run(scrape_all_patents_async(
+        patent_numbers, delay=delay, verbose=verbose, concurrency=concurrency,
+        cache_dir=cache_dir, ttl_days=ttl_days
+    ))
+
+
 if __name__ == "__main__":
     import json
     
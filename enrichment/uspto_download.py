@@ -5,11 +5,13 @@ USPTO PTGRXML Download Functions
 Maps patent numbers to weekly files and downloads them.
 """
 
+import functools
 import os
 import re
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, List, Set, Tuple
 
 # Patent number to grant date mapping (from IPTLpatents-complete.json)
 PATENT_GRANT_DATES = {
@@ -26,7 +28,11 @@ PATENT_GRANT_DATES = {
     "US12034800B2": "2024-07-09",
 }
 
+# Concurrent weekly file downloads; kept small to respect USPTO rate limits
+DEFAULT_DOWNLOAD_WORKERS = 4
 
+
+@functools.lru_cache(maxsize=None)
 def grant_date_to_weekly_filename(grant_date: str) -> str:
     """
     Convert a grant date to the expected USPTO weekly filename.
@@ -45,6 +51,13 @@ def grant_date_to_weekly_filename(grant_date: str) -> str:
     return f"ipg{dt.strftime('%y%m%d')}.zip"
 
 
+# Weekly filename for each known patent, computed once at import
+PATENT_TO_FILENAME = {
+    patent: grant_date_to_weekly_filename(grant_date)
+    for patent, grant_date in PATENT_GRANT_DATES.items()
+}
+
+
 def get_required_files(patent_numbers: List[str]) -> Dict[str, List[str]]:
     """
     Get the set of weekly files needed for the given patents.
@@ -57,13 +70,11 @@ def get_required_files(patent_numbers: List[str]) -> Dict[str, List[str]]:
     """
     files = {}
     for patent in patent_numbers:
-        if patent not in PATENT_GRANT_DATES:
+        filename = PATENT_TO_FILENAME.get(patent)
+        if filename is None:
             print(f"Warning: No grant date for {patent}, skipping")
             continue
         
-        grant_date = PATENT_GRANT_DATES[patent]
-        filename = grant_date_to_weekly_filename(grant_date)
-        
         if filename not in files:
             files[filename] = []
         files[filename].append(patent)
@@ -71,8 +82,22 @@ def get_required_files(patent_numbers: List[str]) -> Dict[str, List[str]]:
     return files
 
 
+def list_downloaded_files(downloads_dir: str) -> Set[str]:
+    """
+    Names of the files already in downloads_dir, read with a single directory scan.
+    
+    Returns an empty set if the directory does not exist yet.
+    """
+    try:
+        with os.scandir(downloads_dir) as entries:
+            return {entry.name for entry in entries if entry.is_file()}
+    except FileNotFoundError:
+        return set()
+
+
 def download_file(filename: str, api_key: str, downloads_dir: str, 
-                  script_path: str = "uspto_bulk_download.py") -> bool:
+                  script_path: str = "uspto_bulk_download.py",
+                  use_subprocess: bool = False) -> bool:
     """
     Download a specific USPTO PTGRXML file.
     
@@ -80,7 +105,9 @@ def download_file(filename: str, api_key: str, downloads_dir: str,
         filename: File to download, e.g., "ipg160322.zip"
         api_key: USPTO API key
         downloads_dir: Directory to save downloads
-        script_path: Path to the download script
+        script_path: Path to the download script (subprocess mode only)
+        use_subprocess: Run the download script in a child process instead
+            of calling it in-process
         
     Returns:
         True if successful, False otherwise
@@ -92,12 +119,50 @@ def download_file(filename: str, api_key: str, downloads_dir: str,
         print(f"  Already exists: {filename}")
         return True
     
+    if not use_subprocess:
+        try:
+            import uspto_bulk_download
+        except ImportError:
+            # Download script not importable from here; run it as a script instead
+            use_subprocess = True
+    
+    if use_subprocess:
+        return download_file_subprocess(filename, api_key, downloads_dir, script_path)
+    
+    print(f"  Downloading: {filename}")
+    try:
+        uspto_bulk_download.download_file(
+            api_key, "PTGRXML", filename, downloads_dir,
+            show_progress=False, verbose=False
+        )
+        return os.path.exists(output_path)
+    except SystemExit:
+        # The download script reports its own errors and exits on failure
+        print(f"  Error downloading {filename}")
+        return False
+    except Exception as e:
+        print(f"  Exception: {e}")
+        return False
+
+
+def download_file_subprocess(filename: str, api_key: str, downloads_dir: str,
+                             script_path: str = "uspto_bulk_download.py") -> bool:
+    """
+    Download a USPTO PTGRXML file by running the download script as a child process.
+    
+    Returns:
+        True if successful, False otherwise
+    """
+    output_path = os.path.join(downloads_dir, filename)
+    
     cmd = [
         "python3", script_path,
         "--api-key", api_key,
         "--download", "PTGRXML",
         "--file", filename,
-        "--output", downloads_dir
+        "--output", downloads_dir,
+        # Files are already downloaded in parallel; one stream each
+        "--connections", "1"
     ]
     
     print(f"  Downloading: {filename}")
@@ -116,7 +181,8 @@ def download_file(filename: str, api_key: str, downloads_dir: str,
 
 
 def download_all_required(patent_numbers: List[str], api_key: str, 
-                          downloads_dir: str, verbose: bool = False) -> Dict[str, str]:
+                          downloads_dir: str, verbose: bool = False,
+                          max_workers: int = DEFAULT_DOWNLOAD_WORKERS) -> Dict[str, str]:
     """
     Download all required USPTO weekly files for the given patents.
     
@@ -125,6 +191,7 @@ def download_all_required(patent_numbers: List[str], api_key: str,
         api_key: USPTO API key
         downloads_dir: Directory to save downloads
         verbose: Print detailed progress
+        max_workers: Number of files downloaded concurrently
         
     Returns:
         Dict mapping patent number to local file path
@@ -137,15 +204,28 @@ def download_all_required(patent_numbers: List[str], api_key: str,
     print()
     
     patent_to_file = {}
+    existing = list_downloaded_files(downloads_dir)
     
-    for filename, patents in sorted(required_files.items()):
-        success = download_file(filename, api_key, downloads_dir)
-        if success:
-            file_path = os.path.join(downloads_dir, filename)
-            for patent in patents:
-                patent_to_file[patent] = file_path
-        else:
-            print(f"  FAILED to download {filename}")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for filename, patents in sorted(required_files.items()):
+            if filename in existing:
+                print(f"  Already exists: {filename}")
+                file_path = os.path.join(downloads_dir, filename)
+                for patent in patents:
+                    patent_to_file[patent] = file_path
+                continue
+            future = executor.submit(download_file, filename, api_key, downloads_dir)
+            futures[future] = (filename, patents)
+        
+        for future in as_completed(futures):
+            filename, patents = futures[future]
+            if future.result():
+                file_path = os.path.join(downloads_dir, filename)
+                for patent in patents:
+                    patent_to_file[patent] = file_path
+            else:
+                print(f"  FAILED to download {filename}")
     
     return patent_to_file
 
@@ -158,13 +238,13 @@ def verify_downloads(patent_numbers: List[str], downloads_dir: str) -> Tuple[Lis
         Tuple of (found_patents, missing_patents)
     """
     required_files = get_required_files(patent_numbers)
+    existing = list_downloaded_files(downloads_dir)
     
     found = []
     missing = []
     
     for filename, patents in required_files.items():
-        file_path = os.path.join(downloads_dir, filename)
-        if os.path.exists(file_path):
+        if filename in existing:
             found.extend(patents)
         else:
             missing.extend(patents)
@@ -5,21 +5,120 @@ USPTO PTGRXML Parser
 Parses USPTO patent grant XML files to extract patent data.
 """
 
+import atexit
+import functools
+import json
 import os
 import re
+import tempfile
 import zipfile
 import xml.etree.ElementTree as ET
-from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Dict, Iterator, List, Optional, Tuple
 from io import BytesIO
 
+# Weekly XML files are hundreds of MB uncompressed; read them in slices
+STREAM_CHUNK_SIZE = 4 * 1024 * 1024
+# Bytes carried between reads so a start tag split across two reads is still found
+STREAM_TAIL_SIZE = 1024
+GRANT_END_TAG = b'</us-patent-grant>'
+# A DOCTYPE, when present, sits right after the XML declaration
+DOCTYPE_SEARCH_LIMIT = 512
+# Complete opening tag of a patent block; requiring the closing '>' means a
+# tag cut off at the end of a read is never matched with a truncated number
+GRANT_START_RE = re.compile(rb'<us-patent-grant[^>]+file="US(\d+)[^>]*>')
+
+# Bump when parse_patent_xml's output changes so old parsed caches are ignored
+PARSED_CACHE_VERSION = 2
+
+# Weekly ZIPs kept open between calls, least recently used first
+MAX_OPEN_ZIPS = 8
+_open_zips = OrderedDict()
+
+# ZIPs whose in-memory parsed cache has entries not yet written to disk
+_unsaved_parsed_caches = set()
+
+# Patterns compiled once at import rather than looked up on every call
+PATENT_NUM_RE = re.compile(r'US(\d+)[A-Z]\d*')
+DEPENDENT_CLAIM_RE = re.compile(r'of claim \d+|according to claim \d+', re.IGNORECASE)
+# Claim type from the preamble; alternatives are tried in order (system,
+# method, medium) and the name of the group that matched is the type
+CLAIM_TYPE_RE = re.compile(
+    r'\d+\.\s*(?:'
+    r'(?P<system>A (?:system|apparatus|device))'
+    r'|(?P<method>A (?:method|process))'
+    r'|(?P<medium>(?:A |An )?(?:non-transitory )?computer.{0,20}(?:medium|storage))'
+    r')',
+    re.IGNORECASE
+)
+
+
+@dataclass
+class Claim:
+    """
+    An independent claim.
+    """
+    # Explicit slots (rather than a dict per instance) keep large batches small
+    __slots__ = ('number', 'type', 'text')
+    number: int
+    type: str
+    text: str
+    
+    def to_dict(self) -> Dict:
+        return {'number': self.number, 'type': self.type, 'text': self.text}
+
+
+@dataclass
+class PatentData:
+    """
+    Fields extracted from one patent's grant XML.
+    
+    number is the patent number as requested by the caller; it is None
+    straight out of parse_patent_xml and filled in by extract_all_patents.
+    """
+    __slots__ = ('title', 'abstract', 'grant_date', 'priority_date', 'application_number',
+                 'assignee_original', 'independent_claims', 'application_family_members', 'number')
+    title: Optional[str]
+    abstract: Optional[str]
+    grant_date: Optional[str]
+    priority_date: Optional[str]
+    application_number: Optional[str]
+    assignee_original: Optional[str]
+    independent_claims: List[Claim]
+    application_family_members: List[str]
+    number: Optional[str]
+    
+    def to_dict(self) -> Dict:
+        return {
+            'title': self.title,
+            'abstract': self.abstract,
+            'grant_date': self.grant_date,
+            'priority_date': self.priority_date,
+            'application_number': self.application_number,
+            'assignee_original': self.assignee_original,
+            'independent_claims': [claim.to_dict() for claim in self.independent_claims],
+            'application_family_members': self.application_family_members,
+            'number': self.number,
+        }
+    
+    @classmethod
+    def from_dict(cls, d: Dict) -> 'PatentData':
+        claims = [Claim(**claim) for claim in d['independent_claims']]
+        return cls(**{**d, 'independent_claims': claims})
+
 
 def normalize_patent_number(patent_num: str) -> str:
     """
     Normalize patent number for matching.
     US9391881B2 -> 09391881
     """
+    # Already normalized (e.g. file numbers from the XML or an index)
+    if len(patent_num) == 8 and patent_num.isdigit():
+        return patent_num
+    
     # Remove country prefix and kind code
-    match = re.match(r'US(\d+)[A-Z]\d*', patent_num)
+    match = PATENT_NUM_RE.match(patent_num)
     if match:
         num = match.group(1)
         # Pad to 8 digits
@@ -27,6 +126,29 @@ def normalize_patent_number(patent_num: str) -> str:
     return patent_num
 
 
+def format_date(d: Optional[str]) -> Optional[str]:
+    """
+    Reformat a USPTO date, YYYYMMDD -> YYYY-MM-DD.
+    
+    Returns None for missing or malformed values.
+    """
+    if d and len(d) == 8 and d.isdigit():
+        return f"{d[:4]}-{d[4:6]}-{d[6:8]}"
+    return None
+
+
+def element_text(elem: ET.Element) -> str:
+    """
+    All text inside an element, including nested children, stripped.
+    
+    Most abstract paragraphs have no child elements, so their text is
+    returned directly without walking the subtree.
+    """
+    if len(elem) == 0:
+        return (elem.text or '').strip()
+    return ''.join(elem.itertext()).strip()
+
+
 def find_patent_in_xml(xml_content: bytes, patent_number: str) -> Optional[str]:
     """
     Find a specific patent's XML block within a weekly file.
@@ -34,78 +156,289 @@ def find_patent_in_xml(xml_content: bytes, patent_number: str) -> Optional[str]:
     The USPTO XML files concatenate multiple patents, each starting with:
     <us-patent-grant ...>
     
+    The search runs on the raw bytes (the markers are plain ASCII) and only
+    the matching block is decoded.
+    
     Returns the XML string for just that patent, or None if not found.
     """
     normalized = normalize_patent_number(patent_number)
     
-    # Convert bytes to string for searching
-    content = xml_content.decode('utf-8', errors='replace')
+    # Find the start of this patent's block: locate its file="USxxxxxxxx
+    # attribute, then step back to the <us-patent-grant tag that owns it
+    marker = b'file="US' + normalized.encode('ascii')
+    pos = xml_content.find(marker)
+    while pos != -1:
+        start_pos = xml_content.rfind(b'<us-patent-grant', 0, pos)
+        if start_pos != -1 and xml_content.find(b'>', start_pos, pos) == -1:
+            break
+        pos = xml_content.find(marker, pos + 1)
+    else:
+        return None
+    
+    # Find the end of this patent block (or end of file)
+    end_pos = xml_content.find(GRANT_END_TAG, start_pos)
+    if end_pos != -1:
+        end_pos += len(GRANT_END_TAG)
+    else:
+        end_pos = len(xml_content)
     
-    # Find the start of this patent's block
-    # Pattern: <us-patent-grant ... file="USxxxxxxxx-...
-    pattern = f'<us-patent-grant[^>]+file="US{normalized}'
+    return xml_content[start_pos:end_pos].decode('utf-8', errors='replace')
+
+
+def open_weekly_zip(zip_path: str) -> Tuple[zipfile.ZipFile, Optional[str]]:
+    """
+    Open a weekly ZIP, reusing a cached handle when possible.
+    
+    Parsing the central directory and finding the XML member is done once
+    per archive instead of once per patent lookup.
+    
+    Returns (zip_file, xml_name); xml_name is None if the ZIP has no XML
+    file. The handle stays owned by the cache - do not close it.
+    """
+    entry = _open_zips.pop(zip_path, None)
+    if entry is None:
+        zf = zipfile.ZipFile(zip_path, 'r')
+        # Get the XML file name (should be only one .xml file)
+        xml_files = [n for n in zf.namelist() if n.endswith('.xml')]
+        entry = (zf, xml_files[0] if xml_files else None)
+        if len(_open_zips) >= MAX_OPEN_ZIPS:
+            _, (oldest, _) = _open_zips.popitem(last=False)
+            oldest.close()
+    _open_zips[zip_path] = entry
+    return entry
+
+
+@atexit.register
+def close_weekly_zips() -> None:
+    """
+    Close every cached weekly ZIP handle.
+    """
+    while _open_zips:
+        _, (zf, _) = _open_zips.popitem()
+        zf.close()
+
+
+def iter_grant_blocks(stream) -> Iterator[Tuple[str, int, bytes]]:
+    """
+    Walk every patent block in a stream of concatenated USPTO XML.
+    
+    The stream is read in chunks and only the block being assembled is kept
+    in memory.
+    
+    Yields (file_number, offset, block) where file_number is the digits of
+    the file="US..." attribute, offset is the block's byte position in the
+    stream and block is its raw bytes up to and including the closing tag.
+    """
+    buffer = bytearray()
+    base = 0  # stream offset of buffer[0]
+    eof = False
+    
+    while True:
+        match = GRANT_START_RE.search(buffer)
+        if match:
+            # Nothing before this block is needed any more
+            if match.start():
+                base += match.start()
+                del buffer[:match.start()]
+                match = GRANT_START_RE.match(buffer)
+            end_pos = buffer.find(GRANT_END_TAG, match.end())
+            if end_pos != -1:
+                end_pos += len(GRANT_END_TAG)
+                yield match.group(1).decode('ascii'), base, bytes(buffer[:end_pos])
+                base += end_pos
+                del buffer[:end_pos]
+                continue
+            if eof:
+                # Unterminated final block runs to the end of the file
+                yield match.group(1).decode('ascii'), base, bytes(buffer)
+                return
+        elif eof:
+            return
+        else:
+            # Keep only a tail that might hold the start of a split tag
+            drop = max(0, len(buffer) - STREAM_TAIL_SIZE)
+            base += drop
+            del buffer[:drop]
+        
+        chunk = stream.read(STREAM_CHUNK_SIZE)
+        if chunk:
+            buffer += chunk
+        else:
+            eof = True
+
+
+def write_json_atomic(path: str, obj) -> None:
+    """
+    Write obj as JSON so readers never see a partially written file.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(obj, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def index_path_for(zip_path: str) -> str:
+    """
+    Path of the offset index sidecar for a weekly ZIP file.
+    """
+    return zip_path + '.idx.json'
+
+
+def build_patent_index(zip_path: str) -> Optional[Dict]:
+    """
+    Scan a weekly ZIP once and record where each patent's XML block lives.
     
-    match = re.search(pattern, content)
-    if not match:
+    The index is saved next to the ZIP as {zip_path}.idx.json:
+        {"xml_name": "ipg160712.xml",
+         "patents": {"09391881": [byte_offset, length], ...}}
+    
+    Returns the index, or None if the ZIP has no XML file.
+    """
+    zf, xml_name = open_weekly_zip(zip_path)
+    if xml_name is None:
+        print(f"No XML files found in {zip_path}")
         return None
     
-    start_pos = match.start()
+    patents = {}
+    with zf.open(xml_name) as f:
+        for file_number, offset, block in iter_grant_blocks(f):
+            patents[file_number] = [offset, len(block)]
     
-    # Find the end of this patent block (next us-patent-grant or end)
-    end_match = re.search(r'</us-patent-grant>', content[start_pos:])
-    if end_match:
-        end_pos = start_pos + end_match.end()
-    else:
-        end_pos = len(content)
+    index = {'xml_name': xml_name, 'patents': patents}
+    
+    # Persist atomically; an unwritable downloads dir just means no reuse
+    try:
+        write_json_atomic(index_path_for(zip_path), index)
+    except OSError as e:
+        print(f"Warning: could not save index for {zip_path}: {e}")
+    
+    return index
+
+
+@functools.lru_cache(maxsize=None)
+def load_patent_index(zip_path: str) -> Optional[Dict]:
+    """
+    Load the offset index for a weekly ZIP, building it on first access.
+    
+    An index older than its ZIP (e.g. after a re-download) is rebuilt.
+    """
+    index_path = index_path_for(zip_path)
+    try:
+        if os.path.getmtime(index_path) >= os.path.getmtime(zip_path):
+            with open(index_path, 'r') as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
     
-    return content[start_pos:end_pos]
+    return build_patent_index(zip_path)
+
+
+def parsed_cache_path_for(zip_path: str) -> str:
+    """
+    Path of the parsed-patent cache sidecar for a weekly ZIP file.
+    """
+    return zip_path + '.parsed.json'
+
+
+@functools.lru_cache(maxsize=None)
+def load_parsed_cache(zip_path: str) -> Dict[str, Dict]:
+    """
+    Load previously parsed patents for a weekly ZIP, keyed by normalized number.
+    
+    Read from disk once per process; the returned dict is shared, and new
+    entries are added to it in place. A cache older than its ZIP or written
+    by a different parser version is ignored, so stale results are never
+    returned.
+    """
+    cache_path = parsed_cache_path_for(zip_path)
+    try:
+        if os.path.getmtime(cache_path) >= os.path.getmtime(zip_path):
+            with open(cache_path, 'r') as f:
+                cache = json.load(f)
+            if cache.get('version') == PARSED_CACHE_VERSION:
+                return cache['patents']
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    return {}
+
+
+def save_parsed_cache(zip_path: str, patents: Dict[str, Dict]) -> None:
+    """
+    Store parsed patents next to their weekly ZIP as {zip_path}.parsed.json.
+    """
+    try:
+        write_json_atomic(parsed_cache_path_for(zip_path),
+                          {'version': PARSED_CACHE_VERSION, 'patents': patents})
+    except OSError as e:
+        print(f"Warning: could not save parsed cache for {zip_path}: {e}")
+    _unsaved_parsed_caches.discard(zip_path)
+
+
+@atexit.register
+def flush_parsed_caches() -> None:
+    """
+    Write every parsed cache that has gained entries since it was last saved.
+    """
+    for zip_path in list(_unsaved_parsed_caches):
+        save_parsed_cache(zip_path, load_parsed_cache(zip_path))
 
 
 def extract_patent_xml(zip_path: str, patent_number: str) -> Optional[str]:
     """
     Extract a specific patent's XML from a weekly ZIP file.
+    
+    Uses the ZIP's offset index to read just the patent's block instead of
+    searching the whole weekly file.
     """
-    with zipfile.ZipFile(zip_path, 'r') as zf:
-        # Get the XML file name (should be only one .xml file)
-        xml_files = [n for n in zf.namelist() if n.endswith('.xml')]
-        if not xml_files:
-            print(f"No XML files found in {zip_path}")
-            return None
-        
-        xml_name = xml_files[0]
-        with zf.open(xml_name) as f:
-            content = f.read()
-            return find_patent_in_xml(content, patent_number)
+    index = load_patent_index(zip_path)
+    if index is None:
+        return None
+    
+    span = index['patents'].get(normalize_patent_number(patent_number))
+    if span is None:
+        return None
+    
+    offset, length = span
+    zf, _ = open_weekly_zip(zip_path)
+    with zf.open(index['xml_name']) as f:
+        # Compressed members can't jump ahead, but seek() only inflates
+        # up to the offset - nothing before the block is scanned or kept
+        f.seek(offset)
+        return f.read(length).decode('utf-8', errors='replace')
 
 
-def parse_patent_xml(xml_string: str) -> Dict:
+def parse_patent_xml(xml_string: str) -> PatentData:
     """
     Parse a single patent's XML and extract relevant fields.
     
-    Returns dict with:
-    - title
-    - abstract
-    - grant_date
-    - priority_date
-    - application_number
-    - assignee_original
-    - independent_claims
-    - application_family_members
-    """
-    result = {
-        'title': None,
-        'abstract': None,
-        'grant_date': None,
-        'priority_date': None,
-        'application_number': None,
-        'assignee_original': None,
-        'independent_claims': [],
-        'application_family_members': []
-    }
-    
-    # Wrap in a root element to handle DTD issues
-    # Remove DOCTYPE declaration which causes parsing issues
-    xml_clean = re.sub(r'<!DOCTYPE[^>]+>', '', xml_string)
+    Fields that can't be found are None (or empty lists); an unparseable
+    document gives a record with nothing filled in.
+    """
+    result = PatentData(
+        title=None,
+        abstract=None,
+        grant_date=None,
+        priority_date=None,
+        application_number=None,
+        assignee_original=None,
+        independent_claims=[],
+        application_family_members=[],
+        number=None,
+    )
+    
+    # Remove DOCTYPE declaration which causes parsing issues. It can only
+    # appear in the prolog, so just the start of the document is checked
+    # (blocks cut from a weekly file begin at <us-patent-grant and have none)
+    xml_clean = xml_string
+    doctype_pos = xml_string.find('<!DOCTYPE', 0, DOCTYPE_SEARCH_LIMIT)
+    if doctype_pos != -1:
+        doctype_end = xml_string.find('>', doctype_pos)
+        if doctype_end != -1:
+            xml_clean = xml_string[:doctype_pos] + xml_string[doctype_end + 1:]
     
     try:
         root = ET.fromstring(xml_clean)
@@ -113,89 +446,84 @@ def parse_patent_xml(xml_string: str) -> Dict:
         print(f"XML Parse Error: {e}")
         return result
     
+    # Each lookup is scoped to its own subtree so ElementTree never walks the
+    # (much larger) <description> looking for bibliographic fields
+    biblio = root.find('us-bibliographic-data-grant')
+    if biblio is None:
+        biblio = root
+    
     # Title
-    title_elem = root.find('.//invention-title')
+    title_elem = biblio.find('.//invention-title')
     if title_elem is not None:
-        result['title'] = title_elem.text
+        result.title = title_elem.text
     
     # Abstract
-    abstract_elem = root.find('.//abstract/p')
+    abstract_elem = root.find('abstract/p')
     if abstract_elem is not None:
         # Get all text including nested elements
-        result['abstract'] = ''.join(abstract_elem.itertext()).strip()
+        result.abstract = element_text(abstract_elem)
     
     # Grant date (publication date)
-    pub_date = root.find('.//publication-reference/document-id/date')
+    pub_date = biblio.find('.//publication-reference/document-id/date')
     if pub_date is not None:
-        # Format: YYYYMMDD -> YYYY-MM-DD
-        d = pub_date.text
-        if d and len(d) == 8:
-            result['grant_date'] = f"{d[:4]}-{d[4:6]}-{d[6:8]}"
+        result.grant_date = format_date(pub_date.text)
     
     # Application number
-    app_num = root.find('.//application-reference/document-id/doc-number')
+    app_num = biblio.find('.//application-reference/document-id/doc-number')
     if app_num is not None:
         num = app_num.text
         # Format as XX/XXXXXX
         if num and len(num) >= 8:
-            result['application_number'] = f"{num[:2]}/{num[2:]}"
+            result.application_number = f"{num[:2]}/{num[2:]}"
         else:
-            result['application_number'] = num
+            result.application_number = num
     
     # Application date (filing date) - can be used as fallback priority
-    app_date = root.find('.//application-reference/document-id/date')
-    filing_date = None
-    if app_date is not None:
-        d = app_date.text
-        if d and len(d) == 8:
-            filing_date = f"{d[:4]}-{d[4:6]}-{d[6:8]}"
+    app_date = biblio.find('.//application-reference/document-id/date')
+    filing_date = format_date(app_date.text) if app_date is not None else None
     
     # Priority date - check multiple sources for earliest date
     priority_dates = []
     
     # Check provisional applications
-    prov_date = root.find('.//us-provisional-application/document-id/date')
-    if prov_date is not None and prov_date.text:
-        d = prov_date.text
-        if len(d) == 8:
-            priority_dates.append(f"{d[:4]}-{d[4:6]}-{d[6:8]}")
+    date_elems = []
+    prov_date = biblio.find('.//us-provisional-application/document-id/date')
+    if prov_date is not None:
+        date_elems.append(prov_date)
     
     # Check parent documents (continuations, CIPs, divisionals)
-    for parent_doc in root.findall('.//us-related-documents//parent-doc/document-id/date'):
-        if parent_doc.text:
-            d = parent_doc.text
-            if len(d) == 8:
-                priority_dates.append(f"{d[:4]}-{d[4:6]}-{d[6:8]}")
+    date_elems.extend(biblio.findall('.//us-related-documents//parent-doc/document-id/date'))
     
     # Check priority-claims (foreign priority)
-    for prio_claim in root.findall('.//priority-claims/priority-claim/date'):
-        if prio_claim.text:
-            d = prio_claim.text
-            if len(d) == 8:
-                priority_dates.append(f"{d[:4]}-{d[4:6]}-{d[6:8]}")
+    date_elems.extend(biblio.findall('.//priority-claims/priority-claim/date'))
+    
+    for date_elem in date_elems:
+        d = format_date(date_elem.text)
+        if d:
+            priority_dates.append(d)
     
     # Use earliest priority date found, or fall back to filing date
     if priority_dates:
-        result['priority_date'] = min(priority_dates)
+        result.priority_date = min(priority_dates)
     elif filing_date:
-        result['priority_date'] = filing_date
+        result.priority_date = filing_date
     
     # Assignee (original)
-    assignee_org = root.find('.//assignees/assignee/addressbook/orgname')
+    assignee_org = biblio.find('.//assignees/assignee/addressbook/orgname')
     if assignee_org is not None:
-        result['assignee_original'] = assignee_org.text
+        result.assignee_original = assignee_org.text
     else:
         # Try individual inventor as assignee
-        last_name = root.find('.//assignees/assignee/addressbook/last-name')
-        first_name = root.find('.//assignees/assignee/addressbook/first-name')
+        last_name = biblio.find('.//assignees/assignee/addressbook/last-name')
+        first_name = biblio.find('.//assignees/assignee/addressbook/first-name')
         if last_name is not None and first_name is not None:
-            result['assignee_original'] = f"{first_name.text} {last_name.text}"
+            result.assignee_original = f"{first_name.text} {last_name.text}"
     
     # Related documents (family members)
     family_members = []
     
     # Related publications (pre-grant pub)
-    for rel_pub in root.findall('.//related-publication/document-id'):
+    for rel_pub in biblio.findall('.//related-publication/document-id'):
         country = rel_pub.find('country')
         doc_num = rel_pub.find('doc-number')
         kind = rel_pub.find('kind')
@@ -205,10 +533,11 @@ def parse_patent_xml(xml_string: str) -> Dict:
                 member += kind.text
             family_members.append(member)
     
-    result['application_family_members'] = family_members
+    result.application_family_members = family_members
     
     # Claims - extract independent claims
-    claims = root.findall('.//claim')
+    claims_elem = root.find('claims')
+    claims = claims_elem.findall('claim') if claims_elem is not None else []
     for claim in claims:
         claim_id = claim.get('id', '')
         claim_num = claim.get('num', '')
@@ -228,51 +557,113 @@ def parse_patent_xml(xml_string: str) -> Dict:
             continue
         
         # Get all text from the first (top-level) claim-text including nested
-        full_text = ''.join(first_text.itertext()).strip()
+        full_text = element_text(first_text)
         
         # Check for dependency by looking at text pattern
-        if re.search(r'of claim \d+|according to claim \d+', full_text, re.IGNORECASE):
+        if DEPENDENT_CLAIM_RE.search(full_text):
             continue
         
         # This appears to be an independent claim
         full_claim_text = full_text
         
-        # Determine claim type
-        claim_type = 'method'  # default
-        if re.match(r'\d+\.\s*A (system|apparatus|device)', full_claim_text, re.IGNORECASE):
-            claim_type = 'system'
-        elif re.match(r'\d+\.\s*A (method|process)', full_claim_text, re.IGNORECASE):
-            claim_type = 'method'
-        elif re.match(r'\d+\.\s*(A |An )?(non-transitory )?computer.{0,20}(medium|storage)', full_claim_text, re.IGNORECASE):
-            claim_type = 'medium'
+        # Determine claim type (default: method)
+        type_match = CLAIM_TYPE_RE.match(full_claim_text)
+        claim_type = type_match.lastgroup if type_match else 'method'
         
         claim_number = int(claim_num) if claim_num.isdigit() else 0
         
-        result['independent_claims'].append({
-            'number': claim_number,
-            'type': claim_type,
-            'text': full_claim_text
-        })
+        result.independent_claims.append(Claim(
+            number=claim_number,
+            type=claim_type,
+            text=full_claim_text
+        ))
     
     return result
 
 
-def extract_patent_data(zip_path: str, patent_number: str) -> Optional[Dict]:
+def extract_patent_data(zip_path: str, patent_number: str) -> Optional[PatentData]:
     """
     Extract all data for a patent from a weekly ZIP file.
+    
+    Parsed patents are cached next to the ZIP, so later runs skip the XML.
+    New entries are written in one batch by flush_parsed_caches() (at exit
+    at the latest) rather than rewriting the cache on every call; for many
+    patents at once, extract_patents_from_zip() is faster still.
     """
+    normalized = normalize_patent_number(patent_number)
+    cache = load_parsed_cache(zip_path)
+    if normalized in cache:
+        return PatentData.from_dict(cache[normalized])
+    
     xml_string = extract_patent_xml(zip_path, patent_number)
     if xml_string is None:
         print(f"Could not find {patent_number} in {zip_path}")
         return None
     
-    return parse_patent_xml(xml_string)
+    data = parse_patent_xml(xml_string)
+    cache[normalized] = data.to_dict()
+    _unsaved_parsed_caches.add(zip_path)
+    return data
 
 
-def extract_all_patents(patent_to_file: Dict[str, str], verbose: bool = False) -> Dict[str, Dict]:
+def extract_patents_from_zip(zip_path: str, patent_numbers: List[str]) -> Dict[str, PatentData]:
+    """
+    Extract several patents from one weekly ZIP in a single streaming pass.
+    
+    Patents already in the ZIP's parsed cache are returned from it. For the
+    rest, every patent block is visited once and only the requested ones
+    are parsed; the scan stops as soon as all of them have been found.
+    
+    Returns dict mapping each found patent number to its extracted data.
+    """
+    cache = load_parsed_cache(zip_path)
+    wanted = {}
+    results = {}
+    for patent_num in patent_numbers:
+        normalized = normalize_patent_number(patent_num)
+        if normalized in cache:
+            results[patent_num] = PatentData.from_dict(cache[normalized])
+        else:
+            wanted.setdefault(normalized, []).append(patent_num)
+    
+    if not wanted:
+        return results
+    
+    zf, xml_name = open_weekly_zip(zip_path)
+    if xml_name is None:
+        print(f"No XML files found in {zip_path}")
+        return results
+    
+    parsed_any = False
+    with zf.open(xml_name) as f:
+        for file_number, _, block in iter_grant_blocks(f):
+            requested = wanted.pop(file_number, None)
+            if requested is None:
+                continue
+            data = parse_patent_xml(block.decode('utf-8', errors='replace'))
+            cache[file_number] = data.to_dict()
+            parsed_any = True
+            for patent_num in requested:
+                results[patent_num] = replace(data)
+            if not wanted:
+                break
+    
+    if parsed_any:
+        save_parsed_cache(zip_path, cache)
+    
+    for requested in wanted.values():
+        for patent_num in requested:
+            print(f"Could not find {patent_num} in {zip_path}")
+    
+    return results
+
+
+def extract_all_patents(patent_to_file: Dict[str, str], verbose: bool = False) -> Dict[str, PatentData]:
     """
     Extract data for all patents from their respective ZIP files.
     
+    Patents sharing a weekly ZIP are extracted together in one pass.
+    
     Args:
         patent_to_file: Dict mapping patent number to ZIP file path
         verbose: Print progress
@@ -280,15 +671,21 @@ def extract_all_patents(patent_to_file: Dict[str, str], verbose: bool = False) -
     Returns:
         Dict mapping patent number to extracted data
     """
-    results = {}
-    
+    file_to_patents = {}
     for patent_num, zip_path in patent_to_file.items():
+        file_to_patents.setdefault(zip_path, []).append(patent_num)
+    
+    extracted = {}
+    for zip_path, patent_numbers in file_to_patents.items():
         if verbose:
-            print(f"  Extracting {patent_num} from {os.path.basename(zip_path)}...")
-        
-        data = extract_patent_data(zip_path, patent_num)
-        if data:
-            data['number'] = patent_num  # Include the patent number
+            print(f"  Extracting {', '.join(patent_numbers)} from {os.path.basename(zip_path)}...")
+        extracted.update(extract_patents_from_zip(zip_path, patent_numbers))
+    
+    results = {}
+    for patent_num in patent_to_file:
+        data = extracted.get(patent_num)
+        if data is not None:
+            data.number = patent_num  # Include the patent number
             results[patent_num] = data
         else:
             print(f"  WARNING: Failed to extract {patent_num}")
@@ -298,17 +695,15 @@ def extract_all_patents(patent_to_file: Dict[str, str], verbose: bool = False) -
 
 if __name__ == "__main__":
     # Test with all patents
-    import json
     import sys
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from enrichment.uspto_download import PATENT_GRANT_DATES, grant_date_to_weekly_filename
+    from enrichment.uspto_download import PATENT_TO_FILENAME
     
     downloads_dir = "downloads"
     
     # Build patent to file mapping
     patent_to_file = {}
-    for patent_num, grant_date in PATENT_GRANT_DATES.items():
-        filename = grant_date_to_weekly_filename(grant_date)
+    for patent_num, filename in PATENT_TO_FILENAME.items():
         patent_to_file[patent_num] = os.path.join(downloads_dir, filename)
     
     print(f"Extracting {len(patent_to_file)} patents from USPTO XML files")
@@ -322,5 +717,5 @@ if __name__ == "__main__":
     print()
     
     for patent_num, data in results.items():
-        claim_count = len(data.get('independent_claims', []))
-        print(f"  {patent_num}: {data.get('title', 'NO TITLE')[:50]}... ({claim_count} claims)")
+        claim_count = len(data.independent_claims)
+        print(f"  {patent_num}: {(data.title or 'NO TITLE')[:50]}... ({claim_count} claims)")
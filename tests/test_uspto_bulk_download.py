@@ -0,0 +1,141 @@
+"""
+Download tests for uspto_bulk_download against a local Range-capable server.
+
+Run with: python -m unittest discover tests
+"""
+
+import http.server
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uspto_bulk_download
+
+FILENAME = "ipg160712.zip"
+DATA = bytes(range(256)) * 256  # 64 KB, every offset distinguishable mod 256
+
+
+class FileServerHandler(http.server.BaseHTTPRequestHandler):
+    """Serves a product listing and DATA, honouring single byte ranges."""
+
+    protocol_version = "HTTP/1.1"
+    # Send "Content-Range: bytes a-b/*" instead of a numeric total
+    unknown_total = False
+    # Answer every request with the whole file, as if Range were unsupported
+    ignore_ranges = False
+
+    def log_message(self, *args):
+        pass
+
+    def send_body(self, status, body, headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        port = self.server.server_address[1]
+        if self.path.startswith("/api/products/"):
+            listing = {"bulkDataProductBag": [{"productFileBag": {"fileDataBag": [{
+                "fileName": FILENAME,
+                "fileSize": len(DATA),
+                "fileDownloadURI": f"http://127.0.0.1:{port}/files/{FILENAME}",
+            }]}}]}
+            self.send_body(200, json.dumps(listing).encode())
+            return
+
+        range_header = self.headers.get("Range")
+        if not range_header or self.ignore_ranges:
+            self.send_body(200, DATA)
+            return
+
+        match = re.match(r"bytes=(\d+)-(\d*)$", range_header)
+        start = int(match.group(1))
+        end = min(int(match.group(2)) if match.group(2) else len(DATA) - 1, len(DATA) - 1)
+        if start >= len(DATA):
+            self.send_body(416, b"", [("Content-Range", f"bytes */{len(DATA)}")])
+            return
+        total = "*" if self.unknown_total else str(len(DATA))
+        self.send_body(206, DATA[start:end + 1], [("Content-Range", f"bytes {start}-{end}/{total}")])
+
+
+class DownloadFileTest(unittest.TestCase):
+
+    def setUp(self):
+        FileServerHandler.unknown_total = False
+        FileServerHandler.ignore_ranges = False
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), FileServerHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.saved = (uspto_bulk_download.API_BASE_URL, uspto_bulk_download.MIN_RANGE_PART_SIZE)
+        uspto_bulk_download.API_BASE_URL = f"http://127.0.0.1:{self.server.server_address[1]}/api/products"
+        uspto_bulk_download.MIN_RANGE_PART_SIZE = 8 * 1024
+
+        self.output_dir = tempfile.mkdtemp()
+        self.output_file = os.path.join(self.output_dir, FILENAME)
+
+    def tearDown(self):
+        uspto_bulk_download.API_BASE_URL, uspto_bulk_download.MIN_RANGE_PART_SIZE = self.saved
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.output_dir)
+
+    def download(self, connections):
+        uspto_bulk_download.download_file(
+            "KEY", "PTGRXML", FILENAME, self.output_dir,
+            show_progress=False, connections=connections, verbose=False
+        )
+        with open(self.output_file, 'rb') as f:
+            return f.read()
+
+    def write_partial(self, size):
+        with open(self.output_file + '.part', 'wb') as f:
+            f.write(DATA[:size])
+
+    def test_single_stream(self):
+        self.assertEqual(self.download(connections=1), DATA)
+
+    def test_parallel_ranges(self):
+        self.assertEqual(self.download(connections=8), DATA)
+
+    def test_probe_with_unknown_total_fetches_whole_file(self):
+        FileServerHandler.unknown_total = True
+        self.assertEqual(self.download(connections=8), DATA)
+
+    def test_resume_partial(self):
+        self.write_partial(1000)
+        self.assertEqual(self.download(connections=1), DATA)
+        self.assertFalse(os.path.exists(self.output_file + '.part'))
+
+    def test_resume_with_unknown_total_appends(self):
+        FileServerHandler.unknown_total = True
+        self.write_partial(1000)
+        self.assertEqual(self.download(connections=1), DATA)
+
+    def test_resume_when_server_ignores_range_restarts(self):
+        FileServerHandler.ignore_ranges = True
+        self.write_partial(1000)
+        self.assertEqual(self.download(connections=1), DATA)
+
+    def test_resume_complete_part(self):
+        # Server answers 416: the .part already holds every byte
+        self.write_partial(len(DATA))
+        self.assertEqual(self.download(connections=1), DATA)
+
+    def test_truncated_final_file_is_resumed(self):
+        with open(self.output_file, 'wb') as f:
+            f.write(DATA[:5000])
+        self.assertEqual(self.download(connections=8), DATA)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -17,18 +17,97 @@ Usage:
 """
 
 import argparse
+import base64
+import http.client
 import json
 import os
+import re
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 import urllib.request
 import urllib.error
-from urllib.parse import urlparse, quote
+from urllib.parse import unquote, urljoin, urlparse, quote
+
+# orjson parses large product listings faster and straight from bytes, but
+# is optional; both paths emit the same UTF-8 bytes (2-space indent)
+try:
+    import orjson
+    
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    
+    def _loads(data):
+        return orjson.loads(data)
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    
+    def _loads(data):
+        return json.loads(data)
 
 # Configuration
 API_BASE_URL = "https://api.uspto.gov/api/v1/datasets/products"
 DEFAULT_API_KEY = os.environ.get("USPTO_API_KEY", "")
+DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024  # 4MB reads keep syscall count low on fast links
+PROGRESS_INTERVAL = 0.25  # seconds between progress line updates
+MAX_REDIRECTS = 5
+DEFAULT_CONNECTIONS = 8  # parallel Range requests per file download
+MIN_RANGE_PART_SIZE = 8 * 1024 * 1024  # don't split files into parts smaller than this
+
+# Keep-alive API connections, one per (scheme, host) per thread
+_thread_local = threading.local()
+
+
+def open_connection(scheme: str, netloc: str, timeout: float) -> http.client.HTTPConnection:
+    """
+    Open an HTTP(S) connection to netloc, through the configured proxy if any.
+    
+    http.client ignores http_proxy/https_proxy/no_proxy, which urllib (and
+    so the file download) honours; this applies the same settings and
+    tunnels through the proxy with CONNECT, so request paths are unchanged.
+    """
+    conn_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+    proxy = urllib.request.getproxies().get(scheme)
+    if not proxy or urllib.request.proxy_bypass(urlparse(f"//{netloc}").hostname):
+        return conn_class(netloc, timeout=timeout)
+    
+    proxy_url = urlparse(proxy if '://' in proxy else f"http://{proxy}")
+    headers = {}
+    if proxy_url.username:
+        credentials = f"{unquote(proxy_url.username)}:{unquote(proxy_url.password or '')}"
+        headers['Proxy-Authorization'] = 'Basic ' + base64.b64encode(credentials.encode()).decode('ascii')
+    conn = conn_class(proxy_url.hostname, proxy_url.port or 80, timeout=timeout)
+    conn.set_tunnel(netloc, headers=headers)
+    return conn
+
+
+def get_connection(scheme: str, netloc: str) -> http.client.HTTPConnection:
+    """
+    Return this thread's persistent connection to an API host.
+    
+    Reusing the connection means the TCP+TLS handshake is paid once rather
+    than on every API call.
+    """
+    connections = getattr(_thread_local, 'connections', None)
+    if connections is None:
+        connections = _thread_local.connections = {}
+    conn = connections.get((scheme, netloc))
+    if conn is None:
+        conn = open_connection(scheme, netloc, timeout=60)
+        connections[(scheme, netloc)] = conn
+    return conn
+
+
+def reset_connection(scheme: str, netloc: str) -> None:
+    """Close and forget this thread's connection to a host."""
+    connections = getattr(_thread_local, 'connections', {})
+    conn = connections.pop((scheme, netloc), None)
+    if conn is not None:
+        conn.close()
 
 
 def make_request(url: str, api_key: str) -> dict:
@@ -39,19 +118,40 @@ def make_request(url: str, api_key: str) -> dict:
         "User-Agent": "USPTO-Bulk-Downloader/1.0"
     }
     
-    req = urllib.request.Request(url, headers=headers)
-    
-    try:
-        with urllib.request.urlopen(req, timeout=60) as response:
-            return json.loads(response.read().decode('utf-8'))
-    except urllib.error.HTTPError as e:
-        print(f"HTTP Error {e.code}: {e.reason}", file=sys.stderr)
-        if e.code == 403:
-            print("Access denied. Check your API key.", file=sys.stderr)
-        sys.exit(1)
-    except urllib.error.URLError as e:
-        print(f"URL Error: {e.reason}", file=sys.stderr)
-        sys.exit(1)
+    retried = False
+    redirects = 0
+    
+    while True:
+        parsed = urlparse(url)
+        path = (parsed.path or '/') + (f"?{parsed.query}" if parsed.query else '')
+        try:
+            conn = get_connection(parsed.scheme, parsed.netloc)
+            conn.request('GET', path, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+        except (http.client.HTTPException, OSError) as e:
+            reset_connection(parsed.scheme, parsed.netloc)
+            # The server may have dropped an idle keep-alive connection; retry once
+            if not retried:
+                retried = True
+                continue
+            print(f"URL Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        
+        if response.status in (301, 302, 303, 307, 308) and redirects < MAX_REDIRECTS:
+            location = response.getheader('Location')
+            if location:
+                url = urljoin(url, location)
+                redirects += 1
+                continue
+        
+        if response.status >= 300:
+            print(f"HTTP Error {response.status}: {response.reason}", file=sys.stderr)
+            if response.status == 403:
+                print("Access denied. Check your API key.", file=sys.stderr)
+            sys.exit(1)
+        
+        return _loads(body)
 
 
 def list_products(api_key: str, search_term: Optional[str] = None) -> None:
@@ -124,8 +224,119 @@ def format_size(size_bytes: int) -> str:
     return f"{size_bytes:.2f} PB"
 
 
-def download_file(api_key: str, product_id: str, filename: str, output_dir: str) -> None:
-    """Download a specific file from a product."""
+class DownloadProgress:
+    """
+    Thread-safe progress line for a download, throttled to PROGRESS_INTERVAL.
+    
+    Only shown on a terminal; redirected output (cron, CI, logs) gets no
+    carriage-return updates.
+    """
+    
+    def __init__(self, total_size: int, enabled: bool = True, downloaded: int = 0):
+        self.total_size = total_size
+        self.enabled = enabled and total_size > 0 and sys.stdout.isatty()
+        self.downloaded = downloaded
+        self.last_print = 0.0
+        self.lock = threading.Lock()
+    
+    def update(self, nbytes: int) -> None:
+        with self.lock:
+            self.downloaded += nbytes
+            if not self.enabled:
+                return
+            # Formatting and flushing shouldn't compete with the transfer;
+            # always show completion
+            now = time.monotonic()
+            if now - self.last_print >= PROGRESS_INTERVAL or self.downloaded >= self.total_size:
+                self.last_print = now
+                pct = (self.downloaded / self.total_size) * 100
+                sys.stdout.write(f"\rProgress: {pct:.1f}% ({format_size(self.downloaded)} / {format_size(self.total_size)})")
+                sys.stdout.flush()
+
+
+def parse_content_range(response) -> Tuple[Optional[int], Optional[int]]:
+    """
+    (first byte, total size) from a 206 response's Content-Range header.
+    
+    Either is None when missing; the total is also None when the server
+    reports it as unknown ("bytes 1000-1999/*").
+    """
+    match = re.match(r'bytes (\d+)-\d+/(\d+|\*)$', response.headers.get('content-range', '').strip())
+    if not match:
+        return None, None
+    total = match.group(2)
+    return int(match.group(1)), (int(total) if total.isdigit() else None)
+
+
+def download_range(url: str, headers: dict, fd: int, start: int, end: int,
+                   progress: DownloadProgress) -> None:
+    """Download bytes start..end (inclusive) of url into fd at the same offset."""
+    req = urllib.request.Request(url, headers={**headers, "Range": f"bytes={start}-{end}"})
+    with urllib.request.urlopen(req, timeout=300) as response:
+        if response.status != 206 or parse_content_range(response)[0] != start:
+            raise urllib.error.URLError(f"server ignored Range request (HTTP {response.status})")
+        offset = start
+        while True:
+            chunk = response.read(DOWNLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            os.pwrite(fd, chunk, offset)
+            offset += len(chunk)
+            progress.update(len(chunk))
+    if offset != end + 1:
+        raise urllib.error.URLError(f"range {start}-{end} ended early at byte {offset}")
+
+
+def download_ranges(url: str, headers: dict, output_file: Path, total_size: int,
+                    connections: int, progress: DownloadProgress) -> None:
+    """
+    Download a file as parallel Range requests written into a pre-sized file.
+    
+    Parts are written to {output_file}.tmp, which is renamed into place only
+    once every range has arrived. The pre-sized file has holes until then,
+    so unlike a sequential .part file it can't be resumed and is discarded
+    on failure.
+    """
+    parts = max(1, min(connections, total_size // MIN_RANGE_PART_SIZE))
+    part_size = -(-total_size // parts)
+    ranges = [(start, min(start + part_size, total_size) - 1)
+              for start in range(0, total_size, part_size)]
+    
+    tmp_file = output_file.with_name(output_file.name + '.tmp')
+    fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        try:
+            os.ftruncate(fd, total_size)
+            with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+                futures = [executor.submit(download_range, url, headers, fd, start, end, progress)
+                           for start, end in ranges]
+                for future in futures:
+                    future.result()
+        finally:
+            os.close(fd)
+    except BaseException:
+        os.unlink(tmp_file)
+        raise
+    os.replace(tmp_file, output_file)
+
+
+def download_file(api_key: str, product_id: str, filename: str, output_dir: str,
+                  show_progress: bool = True, connections: int = 1,
+                  verbose: bool = True) -> None:
+    """
+    Download a specific file from a product.
+    
+    Data is written to {filename}.part and renamed into place once complete,
+    so a file under its final name is always whole. A .part file left by
+    an interrupted download is resumed from where it stopped, and a
+    finished file with the expected size is skipped. Otherwise, with
+    connections > 1 the file is fetched as that many parallel Range
+    requests, falling back to a single stream if the server doesn't
+    support ranges.
+    
+    verbose=False silences the status lines (errors still go to stderr),
+    for callers running several downloads at once.
+    """
     # First get the product to find the exact download URL
     url = f"{API_BASE_URL}/{product_id}"
     data = make_request(url, api_key)
@@ -155,15 +366,32 @@ def download_file(api_key: str, product_id: str, filename: str, output_dir: str)
     download_url = target_file.get('fileDownloadURI')
     file_size = target_file.get('fileSize', 0)
     
-    print(f"\nDownloading: {filename}")
-    print(f"Size: {format_size(file_size)}")
-    print(f"URL: {download_url}")
+    if verbose:
+        print(f"\nDownloading: {filename}")
+        print(f"Size: {format_size(file_size)}")
+        print(f"URL: {download_url}")
     
     # Create output directory
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
     output_file = output_path / filename
     
+    part_file = output_file.with_name(output_file.name + '.part')
+    
+    if output_file.exists():
+        size = output_file.stat().st_size
+        if not file_size or size == file_size:
+            if verbose:
+                print(f"\n✓ Already downloaded: {output_file}")
+            return
+        if size < file_size:
+            # Truncated file from before downloads went through .part
+            os.replace(output_file, part_file)
+    
+    existing = part_file.stat().st_size if part_file.exists() else 0
+    if file_size and existing > file_size:
+        existing = 0  # Not a prefix of this file; start over
+    
     # Download with progress - the API returns a redirect to a presigned CloudFront URL
     headers = {
         "X-API-Key": api_key,
@@ -176,40 +404,95 @@ def download_file(api_key: str, product_id: str, filename: str, output_dir: str)
     encoded_url = f"{parsed.scheme}://{parsed.netloc}{encoded_path}"
     
     req = urllib.request.Request(encoded_url, headers=headers)
+    # Resume a partial file from its end. Otherwise probe with a one-byte
+    # range: a 206 reveals the total size and the post-redirect URL for the
+    # parallel parts, a 200 is just the file
+    use_ranges = not existing and connections > 1 and hasattr(os, 'pwrite')
+    if existing:
+        req.add_header("Range", f"bytes={existing}-")
+    elif use_ranges:
+        req.add_header("Range", "bytes=0-0")
     
     try:
-        with urllib.request.urlopen(req, timeout=300) as response:
+        response = urllib.request.urlopen(req, timeout=300)
+        if use_ranges and response.status == 206 and parse_content_range(response)[1] is None:
+            # A 206 with an unknown total ("bytes 0-0/*") can't size the parts
+            # and its body is just the probe byte; fetch the file whole instead
+            response.close()
+            use_ranges = False
+            response = urllib.request.urlopen(
+                urllib.request.Request(encoded_url, headers=headers), timeout=300
+            )
+        
+        with response:
             # Get final URL (after redirect)
             final_url = response.geturl()
-            total_size = int(response.headers.get('content-length', file_size))
+            # Only a 206 means the server honoured the Range; on a 200 the
+            # body is the whole file, whatever was asked for
+            content_length = response.headers.get('content-length')
+            range_start, range_total = parse_content_range(response)
+            offset = 0
+            if response.status != 206:
+                total_size = int(content_length) if content_length else file_size
+            elif use_ranges:
+                total_size = range_total  # numeric, checked above
+            else:
+                if range_start != existing:
+                    raise urllib.error.URLError(
+                        f"asked to resume at byte {existing}, server sent "
+                        f"{response.headers.get('content-range')!r}"
+                    )
+                offset = existing
+                if range_total is not None:
+                    total_size = range_total
+                elif content_length:
+                    total_size = existing + int(content_length)
+                else:
+                    total_size = 0  # unknown; nothing to check against
             
-            print(f"Downloading from: {final_url[:80]}...")
-            print(f"Saving to: {output_file}")
+            if verbose:
+                print(f"Downloading from: {final_url[:80]}...")
+                print(f"Saving to: {output_file}")
+                if offset:
+                    print(f"Resuming at: {format_size(offset)}")
             
-            downloaded = 0
-            chunk_size = 1024 * 1024  # 1MB chunks
+            progress = DownloadProgress(total_size, show_progress, downloaded=offset)
             
-            with open(output_file, 'wb') as f:
-                while True:
-                    chunk = response.read(chunk_size)
-                    if not chunk:
-                        break
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    
-                    # Progress indicator
-                    if total_size > 0:
-                        pct = (downloaded / total_size) * 100
-                        print(f"\rProgress: {pct:.1f}% ({format_size(downloaded)} / {format_size(total_size)})", end='', flush=True)
+            if use_ranges and response.status == 206:
+                response.read()
+                download_ranges(final_url, headers, output_file, total_size, connections, progress)
+            else:
+                with open(part_file, 'ab' if offset else 'wb') as f:
+                    while True:
+                        chunk = response.read(DOWNLOAD_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        f.write(chunk)
+                        progress.update(len(chunk))
+                received = part_file.stat().st_size
+                if total_size and received != total_size:
+                    raise urllib.error.URLError(f"download ended early at byte {received}")
+                os.replace(part_file, output_file)
             
-            print(f"\n\n✓ Download complete: {output_file}")
+            if verbose:
+                print(f"\n\n✓ Download complete: {output_file}")
             
     except urllib.error.HTTPError as e:
+        if e.code == 416 and existing:
+            # Nothing left past the end of the part we already have
+            os.replace(part_file, output_file)
+            if verbose:
+                print(f"\n✓ Already downloaded: {output_file}")
+            return
         print(f"\nHTTP Error {e.code}: {e.reason}", file=sys.stderr)
         sys.exit(1)
     except urllib.error.URLError as e:
         print(f"\nURL Error: {e.reason}", file=sys.stderr)
         sys.exit(1)
+    except (http.client.HTTPException, OSError) as e:
+        # e.g. the connection dropped mid-transfer; a .part file is kept
+        print(f"\nDownload Error: {e}", file=sys.stderr)
+        sys.exit(1)
 
 
 def main():
@@ -254,6 +537,11 @@ Get an API key at: https://data.uspto.gov/myodp/key-reveal
                         default='./downloads',
                         help='Output directory for downloads (default: ./downloads)')
     
+    parser.add_argument('--connections', '-c',
+                        type=int,
+                        default=DEFAULT_CONNECTIONS,
+                        help=f'Parallel connections per download (default: {DEFAULT_CONNECTIONS})')
+    
     parser.add_argument('--json', '-j',
                         action='store_true',
                         help='Output raw JSON (for product details)')
@@ -273,13 +561,15 @@ Get an API key at: https://data.uspto.gov/myodp/key-reveal
     elif args.product:
         product = get_product_details(args.api_key, args.product)
         if args.json:
-            print(json.dumps(product, indent=2))
+            sys.stdout.flush()
+            sys.stdout.buffer.write(_dumps(product) + b'\n')
     
     elif args.download:
         if not args.file:
             print("Error: --file required with --download", file=sys.stderr)
             sys.exit(1)
-        download_file(args.api_key, args.download, args.file, args.output)
+        download_file(args.api_key, args.download, args.file, args.output,
+                      connections=args.connections)
     
     else:
         parser.print_help()